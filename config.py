@@ -36,3 +36,7 @@ MAX_DAILY_LOSS_PCT = 0.03     # Stop trading if cumulative daily loss hits 3%
 MIN_VOLATILITY = 0.10         # Skip stocks with < 10% annual volatility (too stable)
 REQUIRE_UPTREND = True        # Only trade stocks in uptrend (SMA50 > SMA200)
 MIN_TRADES_TO_REPORT = 3      # Only report symbols with at least 3 trades
+BACKTEST_DAYS = 7             # Backtest the last N calendar days of 1-minute data
+
+# ===== PERFORMANCE =====
+MAX_WORKERS = None            # Worker processes for per-symbol work (None = all CPU cores, 1 = no pool)
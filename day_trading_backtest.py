@@ -9,14 +9,109 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
 from cache_manager import CacheManager
+from indicators_njit import compute_indicators, njit
 from stock_list import get_all_stocks
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 import json
 import os
+from concurrent.futures import ProcessPoolExecutor
 import config
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard json module
+    orjson = None
+
+
+# Parquet columns each phase reads (projection avoids decoding unused columns)
+DAILY_COLUMNS = ['Date', 'Open', 'High', 'Low', 'Close']
+INTRADAY_COLUMNS = ['Date', 'Close']
+
+
+# Float fields of a symbol's daily patterns (saved as null when not finite)
+PATTERN_FLOAT_KEYS = ('recent_trend_20d', 'annual_volatility', 'avg_daily_range_pct', 'win_rate', 'current_price')
+
+
+# Exit reasons in the order _simulate_trades checks them (index = reason code)
+EXIT_REASONS = ('Profit Target', 'Stop Loss', 'Time Exit', 'Large Move')
+
+
+@njit(cache=True)
+def _simulate_trades(close, entry_mask, first_bar, last_bar,
+                     slippage_pct, commission_pct, flat_rate,
+                     profit_target_pct, stop_loss_pct, max_hold_minutes, large_move_pct):
+    """
+    Walk bars first_bar..last_bar - 1 holding at most one position at a time.
+
+    A position opens on a bar where entry_mask is set and closes on the first
+    later bar that hits an exit rule; the next entry can come on the bar after
+    the exit. A position still open when the bars run out is dropped.
+
+    Returns:
+        Tuple of arrays (entry bar, exit bar, profit %, index into EXIT_REASONS)
+    """
+    n = max(last_bar - first_bar, 0)
+    entry_idxs = np.empty(n, np.int64)
+    exit_idxs = np.empty(n, np.int64)
+    profits = np.empty(n)
+    reasons = np.empty(n, np.int8)
+    n_trades = 0
+
+    i = first_bar
+    while i < last_bar:
+        if not entry_mask[i]:
+            i += 1
+            continue
+
+        entry_price = close[i]
+
+        # Apply slippage and commission to entry price
+        entry_price_with_costs = entry_price * (1 + slippage_pct / 100)
+
+        # Add percentage-based commission (if > 0)
+        if commission_pct > 0:
+            entry_price_with_costs *= (1 + commission_pct)
+
+        # Add flat rate commission (if > 0, convert to % of entry price)
+        if flat_rate > 0:
+            flat_rate_pct = flat_rate / entry_price
+            entry_price_with_costs += flat_rate_pct * entry_price
+
+        exit_bar = -1
+        for j in range(i + 1, last_bar):
+            # Profit/loss calculation (accounting for costs)
+            profit_pct = ((close[j] - entry_price_with_costs) / entry_price_with_costs) * 100
+
+            if profit_pct >= profit_target_pct:
+                reason = 0
+            elif profit_pct <= -stop_loss_pct:
+                reason = 1
+            elif (j - i) > max_hold_minutes:
+                reason = 2
+            elif abs(profit_pct) > large_move_pct:
+                reason = 3
+            else:
+                continue
+
+            entry_idxs[n_trades] = i
+            exit_idxs[n_trades] = j
+            profits[n_trades] = profit_pct
+            reasons[n_trades] = reason
+            n_trades += 1
+            exit_bar = j
+            break
+
+        if exit_bar < 0:
+            break  # Position still open when the data runs out
+        i = exit_bar + 1
+
+    return entry_idxs[:n_trades], exit_idxs[:n_trades], profits[:n_trades], reasons[:n_trades]
+
 
 class DayTradingAlgorithm:
     """
@@ -43,28 +138,40 @@ class DayTradingAlgorithm:
             return None
 
         try:
-            df = df_daily.sort_values('Date').copy()
+            # Parquet files are written in time order, so sorting is usually unnecessary.
+            # Only scalars are derived below, so no copy is needed either.
+            if df_daily['Date'].is_monotonic_increasing:
+                df = df_daily
+            else:
+                df = df_daily.sort_values('Date')
+            
+            close = df['Close'].to_numpy(np.float64)
             
-            # Daily returns and volatility
-            df['Daily_Return'] = df['Close'].pct_change()
-            df['Volatility'] = df['Daily_Return'].rolling(window=20).std() * np.sqrt(252)
+            # Annualized volatility of the last 20 daily returns
+            recent_returns = close[-20:] / close[-21:-1] - 1
+            annual_volatility = recent_returns.std(ddof=1) * np.sqrt(252)
             
-            # Trend indicators
-            df['SMA50'] = df['Close'].rolling(window=50).mean()
-            df['SMA200'] = df['Close'].rolling(window=200).mean()
+            # Trend indicators (latest 50- and 200-day SMAs)
+            sma50 = close[-50:].mean()
+            sma200 = close[-200:].mean() if len(close) >= 200 else np.nan
             
             # Recent performance
-            recent_20_return = (df.iloc[-1]['Close'] / df.iloc[-20]['Close'] - 1) * 100
-            annual_volatility = df['Volatility'].iloc[-1]
-            in_uptrend = df.iloc[-1]['SMA50'] > df.iloc[-1]['SMA200']
+            recent_20_return = (close[-1] / close[-20] - 1) * 100
+            in_uptrend = sma50 > sma200
             
-            # Average daily move (intraday trading range)
-            df['High_Low_Pct'] = ((df['High'] - df['Low']) / df['Low']) * 100 if 'High' in df.columns else 0
-            avg_daily_range = df['High_Low_Pct'].tail(60).mean()
+            # Average daily move (intraday trading range), only the last 60 days are used
+            if 'High' in df.columns:
+                high_tail = df['High'].to_numpy(np.float64)[-60:]
+                low_tail = df['Low'].to_numpy(np.float64)[-60:]
+                avg_daily_range = np.nanmean(((high_tail - low_tail) / low_tail) * 100)
+            else:
+                avg_daily_range = 0.0
             
             # Win rate based on close above open
             if 'Open' in df.columns:
-                win_rate = (df['Close'] > df['Open']).tail(60).sum() / 60 * 100
+                close_tail = df['Close'].to_numpy(np.float64)[-60:]
+                open_tail = df['Open'].to_numpy(np.float64)[-60:]
+                win_rate = (close_tail > open_tail).sum() / 60 * 100
             else:
                 win_rate = 50.0
             
@@ -74,28 +181,55 @@ class DayTradingAlgorithm:
                 'in_uptrend': in_uptrend,
                 'avg_daily_range_pct': avg_daily_range,
                 'win_rate': win_rate,
-                'current_price': df.iloc[-1]['Close'],
+                'current_price': close[-1],
             }
         except Exception as e:
             print(f"Error analyzing daily patterns: {e}")
             return None
 
+    def analyze_symbol(self, symbol):
+        """
+        Load a symbol's daily data from the cache and analyze its patterns.
+
+        Loading here rather than in the caller means a worker process only
+        receives the symbol and returns the small patterns dict; the daily
+        DataFrame never crosses the process boundary.
+        """
+        df_daily = self.cache_mgr.get_cached_symbol(symbol, columns=DAILY_COLUMNS)
+        if df_daily is None or len(df_daily) < 100:
+            return None
+        
+        # Filter daily to only daily (some may have 1m in the same symbol)
+        if pd.api.types.is_datetime64_any_dtype(df_daily['Date']):
+            df_daily = df_daily[df_daily['Date'].dt.hour == 0]
+        
+        return self.analyze_daily_patterns(df_daily)
+
     def save_algorithm(self, algorithm_dict):
         """Save trained algorithm (daily patterns) to JSON file."""
-        # Convert non-JSON-serializable types
+        # Convert non-JSON-serializable types. NaN/inf are stored as null so
+        # orjson and the json fallback write (and read back) the same file.
+        def finite_or_none(value):
+            value = float(value)
+            return value if np.isfinite(value) else None
+
         safe_dict = {}
         for symbol, patterns in algorithm_dict.items():
             safe_dict[symbol] = {
-                'recent_trend_20d': float(patterns['recent_trend_20d']),
-                'annual_volatility': float(patterns['annual_volatility']),
+                'recent_trend_20d': finite_or_none(patterns['recent_trend_20d']),
+                'annual_volatility': finite_or_none(patterns['annual_volatility']),
                 'in_uptrend': bool(patterns['in_uptrend']),
-                'avg_daily_range_pct': float(patterns['avg_daily_range_pct']),
-                'win_rate': float(patterns['win_rate']),
-                'current_price': float(patterns['current_price']),
+                'avg_daily_range_pct': finite_or_none(patterns['avg_daily_range_pct']),
+                'win_rate': finite_or_none(patterns['win_rate']),
+                'current_price': finite_or_none(patterns['current_price']),
             }
         
-        with open(self.ALGORITHM_FILE, 'w') as f:
-            json.dump(safe_dict, f, indent=2)
+        if orjson is not None:
+            with open(self.ALGORITHM_FILE, 'wb') as f:
+                f.write(orjson.dumps(safe_dict, option=orjson.OPT_INDENT_2))
+        else:
+            with open(self.ALGORITHM_FILE, 'w') as f:
+                json.dump(safe_dict, f, indent=2)
         print(f"[OK] Algorithm saved to {self.ALGORITHM_FILE} ({len(algorithm_dict)} symbols)")
 
     def load_algorithm(self):
@@ -104,8 +238,18 @@ class DayTradingAlgorithm:
             return None
         
         try:
-            with open(self.ALGORITHM_FILE, 'r') as f:
-                algo_dict = json.load(f)
+            with open(self.ALGORITHM_FILE, 'rb') as f:
+                data = f.read()
+            try:
+                algo_dict = orjson.loads(data) if orjson is not None else json.loads(data)
+            except ValueError:
+                # Older files written by json.dump may contain NaN literals, which orjson rejects
+                algo_dict = json.loads(data)
+            # Missing (null) values were non-finite when saved
+            for patterns in algo_dict.values():
+                for key in PATTERN_FLOAT_KEYS:
+                    if patterns.get(key) is None:
+                        patterns[key] = np.nan
             print(f"[OK] Algorithm loaded from {self.ALGORITHM_FILE} ({len(algo_dict)} symbols)")
             return algo_dict
         except Exception as e:
@@ -126,107 +270,64 @@ class DayTradingAlgorithm:
             return None, None
 
         try:
-            df = df_1m.sort_values('Date').copy()
+            # Only columns are read from here on, so an ordered frame needs no copy
+            if df_1m['Date'].is_monotonic_increasing:
+                df = df_1m
+            else:
+                df = df_1m.sort_values('Date')
             
             # Only proceed if we have daily volatility
             if daily_patterns['annual_volatility'] < config.MIN_VOLATILITY:
                 return None, None  # Too stable for day trading
             
-            # Calculate 1-minute indicators
-            df['SMA5'] = df['Close'].rolling(window=config.SMA_PERIOD).mean()
-            df['SMA20'] = df['Close'].rolling(window=20).mean()
+            # Only buy dips in uptrends, so no trades are possible otherwise
+            if not daily_patterns['in_uptrend']:
+                return None, None
             
-            # RSI on 1-minute
-            delta = df['Close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            rs = gain / loss
-            df['RSI'] = 100 - (100 / (1 + rs))
+            # Raw arrays for the trade loop; DatetimeArray keeps timezone-aware Timestamps
+            close = df['Close'].to_numpy(np.float64)
+            dates = df['Date'].array
             
-            # Volatility bands (adaptive)
-            df['Volatility_1m'] = df['Close'].rolling(window=20).std()
+            # Calculate 1-minute indicators in one pass, kept as arrays rather than
+            # DataFrame columns (SMA20 and volatility bands don't drive entries)
+            sma5, _, _, rsi = compute_indicators(close, config.SMA_PERIOD, 20, 14)
             
-            trades = []
-            in_trade = False
-            entry_price = 0
-            entry_idx = 0
+            # Bars eligible for entries and exits (first 20 warm up the indicators)
+            first_bar = 20
+            last_bar = len(df) - 5
             
-            for i in range(20, len(df) - 5):
-                current = df.iloc[i]
-                prev = df.iloc[i - 1]
-                
-                # Entry conditions: Buy dips in uptrend
-                if not in_trade and daily_patterns['in_uptrend']:
-                    # Signal: Price pulls back (below SMA5) with oversold RSI
-                    if current['Close'] < current['SMA5'] and current['RSI'] < config.RSI_OVERSOLD_THRESHOLD:
-                        entry_price = current['Close']
-                        entry_idx = i
-                        in_trade = True
-                        continue
-                
-                # Exit conditions
-                if in_trade:
-                    # Apply slippage and commission to entry price
-                    entry_price_with_costs = entry_price * (1 + config.SLIPPAGE_PCT / 100)
-                    
-                    # Add percentage-based commission (if > 0)
-                    if config.COMMISSION_PER_TRADE > 0:
-                        entry_price_with_costs *= (1 + config.COMMISSION_PER_TRADE)
-                    
-                    # Add flat rate commission (if > 0, convert to % of entry price)
-                    if config.COMMISSION_FLAT_RATE > 0:
-                        flat_rate_pct = config.COMMISSION_FLAT_RATE / entry_price
-                        entry_price_with_costs += flat_rate_pct * entry_price
-                    
-                    # Profit/loss calculation (accounting for costs)
-                    profit_pct = ((current['Close'] - entry_price_with_costs) / entry_price_with_costs) * 100
-                    
-                    # Take profit
-                    if profit_pct >= config.PROFIT_TARGET_PCT:
-                        trades.append({
-                            'entry_time': df.iloc[entry_idx]['Date'],
-                            'entry_price': entry_price,
-                            'exit_time': current['Date'],
-                            'exit_price': current['Close'],
-                            'profit_pct': profit_pct,
-                            'hold_minutes': i - entry_idx,
-                            'exit_reason': 'Profit Target',
-                        })
-                        in_trade = False
-                    
-                    # Stop loss
-                    elif profit_pct <= -config.STOP_LOSS_PCT:
-                        trades.append({
-                            'entry_time': df.iloc[entry_idx]['Date'],
-                            'entry_price': entry_price,
-                            'exit_time': current['Date'],
-                            'exit_price': current['Close'],
-                            'profit_pct': profit_pct,
-                            'hold_minutes': i - entry_idx,
-                            'exit_reason': 'Stop Loss',
-                        })
-                        in_trade = False
-                    
-                    # Time-based exit
-                    elif (i - entry_idx) > config.MAX_HOLD_TIME_MINUTES or abs(profit_pct) > config.LARGE_MOVE_EXIT_PCT:
-                        trades.append({
-                            'entry_time': df.iloc[entry_idx]['Date'],
-                            'entry_price': entry_price,
-                            'exit_time': current['Date'],
-                            'exit_price': current['Close'],
-                            'profit_pct': profit_pct,
-                            'hold_minutes': i - entry_idx,
-                            'exit_reason': 'Time Exit' if (i - entry_idx) > config.MAX_HOLD_TIME_MINUTES else 'Large Move',
-                        })
-                        in_trade = False
+            # Entry conditions: Buy dips in uptrend
+            # Signal: Price pulls back (below SMA5) with oversold RSI
+            entry_mask = (close < sma5) & (rsi < config.RSI_OVERSOLD_THRESHOLD)
             
-            if trades:
-                df_trades = pd.DataFrame(trades)
-                win_count = (df_trades['profit_pct'] > 0).sum()
-                total_pnl = df_trades['profit_pct'].sum()
-                win_rate = (win_count / len(df_trades)) * 100
-                avg_win = df_trades[df_trades['profit_pct'] > 0]['profit_pct'].mean() if win_count > 0 else 0
-                avg_loss = df_trades[df_trades['profit_pct'] <= 0]['profit_pct'].mean() if (len(df_trades) - win_count) > 0 else 0
+            # Walk entries and exits in compiled code (costs and exit rules from config)
+            entry_idxs, exit_idxs, profits, reasons = _simulate_trades(
+                close, entry_mask, first_bar, last_bar,
+                config.SLIPPAGE_PCT, config.COMMISSION_PER_TRADE, config.COMMISSION_FLAT_RATE,
+                config.PROFIT_TARGET_PCT, config.STOP_LOSS_PCT,
+                config.MAX_HOLD_TIME_MINUTES, config.LARGE_MOVE_EXIT_PCT,
+            )
+            
+            if len(entry_idxs):
+                # One column per trade field, straight from the kernel's arrays
+                df_trades = pd.DataFrame({
+                    'entry_time': dates[entry_idxs],
+                    'entry_price': close[entry_idxs],
+                    'exit_time': dates[exit_idxs],
+                    'exit_price': close[exit_idxs],
+                    'profit_pct': profits,
+                    'hold_minutes': exit_idxs - entry_idxs,
+                    'exit_reason': pd.Categorical.from_codes(reasons, EXIT_REASONS),
+                })
+                
+                # Stats straight from the profit array, building each mask once
+                wins = profits > 0
+                losses = profits <= 0
+                win_count = wins.sum()
+                total_pnl = np.nansum(profits)
+                win_rate = (win_count / len(profits)) * 100
+                avg_win = profits[wins].mean() if win_count > 0 else 0
+                avg_loss = profits[losses].mean() if losses.any() else 0
                 
                 stats = {
                     'total_trades': len(df_trades),
@@ -248,6 +349,97 @@ class DayTradingAlgorithm:
             return None, None
 
 
+def _parallel_map(func, *iterables):
+    """
+    Map func over the iterables in worker processes, preserving input order.
+
+    Runs in-process when config.MAX_WORKERS is 1.
+    """
+    workers = config.MAX_WORKERS or os.cpu_count() or 1
+    if workers == 1:
+        yield from map(func, *iterables)
+        return
+    
+    iterables = [list(it) for it in iterables]
+    chunksize = max(1, len(iterables[0]) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(func, *iterables, chunksize=chunksize)
+
+
+def _read_intraday_tail(path, columns, days):
+    """
+    Read the last `days` calendar days of an intraday parquet file.
+
+    The cutoff is measured back from the newest bar in the Date column's
+    row-group statistics. Only row groups reaching past the cutoff are
+    decoded, from the same open file whose metadata was already parsed.
+    Falls back to reading every row if Date is not stored as a timestamp or
+    has no statistics.
+    """
+    parquet_file = pq.ParquetFile(path, memory_map=True)
+    schema = parquet_file.schema_arrow
+    date_idx = schema.get_field_index('Date')
+    
+    # (oldest, newest) bar of each row group
+    date_ranges = []
+    if date_idx >= 0 and pa.types.is_timestamp(schema.field(date_idx).type):
+        metadata = parquet_file.metadata
+        for rg in range(metadata.num_row_groups):
+            stats = metadata.row_group(rg).column(date_idx).statistics
+            if stats is None or not stats.has_min_max:
+                date_ranges = []
+                break
+            date_ranges.append((stats.min, stats.max))
+    
+    if not date_ranges:
+        return parquet_file.read(columns=columns).to_pandas()
+    
+    cutoff = max(newest for _, newest in date_ranges) - pd.Timedelta(days=days)
+    row_groups = [rg for rg, (_, newest) in enumerate(date_ranges) if newest >= cutoff]
+    table = parquet_file.read_row_groups(row_groups, columns=columns)
+    
+    # Row groups straddling the cutoff still hold some older rows
+    if min(date_ranges[rg][0] for rg in row_groups) < cutoff:
+        cutoff_scalar = pa.scalar(cutoff, type=schema.field(date_idx).type)
+        table = table.filter(pc.greater_equal(table['Date'], cutoff_scalar))
+    return table.to_pandas()
+
+
+def _backtest_symbol(symbol, daily_patterns, cache_dir):
+    """
+    Load a symbol's 1-minute parquet file and backtest it.
+
+    Module-level so it can run in a worker process. Returns the result dict
+    for reporting, or None if the symbol has no usable data or too few trades.
+    """
+    # Load 1-minute intraday data from parquet file
+    try:
+        parquet_1m = os.path.join(cache_dir, f"{symbol}_1m.parquet")
+        if os.path.exists(parquet_1m):
+            df_1m = _read_intraday_tail(parquet_1m, INTRADAY_COLUMNS, config.BACKTEST_DAYS)
+        else:
+            return None
+    except:
+        return None
+    
+    if len(df_1m) < 100:
+        return None
+    
+    # Backtest (no cache access needed, so no CacheManager in the worker)
+    algo = DayTradingAlgorithm(None)
+    trades_df, stats = algo.backtest_intraday_trades(df_1m, daily_patterns)
+    
+    if stats is None or stats['total_trades'] < config.MIN_TRADES_TO_REPORT:
+        return None
+    
+    return {
+        'symbol': symbol,
+        'daily_patterns': daily_patterns,
+        'stats': stats,
+        'trades': trades_df,
+    }
+
+
 def main():
     cache_mgr = CacheManager()
     algo = DayTradingAlgorithm(cache_mgr)
@@ -298,19 +490,9 @@ def main():
     
     # Training phase (if not skipped)
     if not skip_training:
-        for symbol in symbols:
-            # Load daily data
-            df_daily = cache_mgr.get_cached_symbol(symbol)
-            if df_daily is None or len(df_daily) < 100:
-                continue
-            
-            # Filter daily to only daily (some may have 1m in the same symbol)
-            df_daily = df_daily[df_daily['Date'].dt.hour == 0] if 'hour' in df_daily['Date'].dt.__dir__() else df_daily
-            if len(df_daily) < 100:
-                continue
-            
-            # Analyze 10 years of daily patterns
-            daily_patterns = algo.analyze_daily_patterns(df_daily)
+        # Load and analyze 10 years of daily patterns, one symbol per worker task
+        patterns = _parallel_map(algo.analyze_symbol, symbols)
+        for symbol, daily_patterns in zip(symbols, patterns):
             if daily_patterns is not None:
                 algorithm_dict[symbol] = daily_patterns
         
@@ -325,38 +507,21 @@ def main():
     print("\nRunning backtest with trained algorithm...")
     results = []
     
-    for symbol in algorithm_dict.keys():
-        daily_patterns = algorithm_dict[symbol]
-        
-        # Load 1-minute intraday data from parquet file
-        try:
-            parquet_1m = os.path.join(cache_mgr.cache_dir, f"{symbol}_1m.parquet")
-            if os.path.exists(parquet_1m):
-                df_1m = pd.read_parquet(parquet_1m)
-                if 'Date' in df_1m.columns:
-                    df_1m['Date'] = pd.to_datetime(df_1m['Date'])
-            else:
-                continue
-        except:
-            continue
-        
-        if len(df_1m) < 100:
-            continue
-        
-        # Backtest
-        trades_df, stats = algo.backtest_intraday_trades(df_1m, daily_patterns)
-        
-        if stats is None or stats['total_trades'] < config.MIN_TRADES_TO_REPORT:
+    symbols_to_test = list(algorithm_dict.keys())
+    backtests = _parallel_map(
+        _backtest_symbol,
+        symbols_to_test,
+        [algorithm_dict[s] for s in symbols_to_test],
+        [cache_mgr.cache_dir] * len(symbols_to_test),
+    )
+    
+    for result in backtests:
+        if result is None:
             continue
         
-        print(f"  [{len(results)+1}] {symbol}: {stats['total_trades']} trades, {stats['win_rate']:.1f}% win rate, {stats['total_pnl_pct']:+.2f}% P&L", flush=True)
-        
-        results.append({
-            'symbol': symbol,
-            'daily_patterns': daily_patterns,
-            'stats': stats,
-            'trades': trades_df,
-        })
+        stats = result['stats']
+        print(f"  [{len(results)+1}] {result['symbol']}: {stats['total_trades']} trades, {stats['win_rate']:.1f}% win rate, {stats['total_pnl_pct']:+.2f}% P&L", flush=True)
+        results.append(result)
     
     # Sort by total PnL
     results.sort(key=lambda x: x['stats']['total_pnl_pct'], reverse=True)
@@ -6,6 +6,8 @@ and perform various analyses without re-downloading.
 """
 
 import sys
+import threading
+import time
 from pathlib import Path
 
 # Add src directory to path
@@ -16,10 +18,11 @@ from analyzer import StockAnalyzer
 from cache_manager import CacheManager
 from stock_list import get_all_stocks, get_stocks_by_category
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 
 
-def download_stock_database(fetcher, cache_mgr, symbols=None, force_refresh=False, interval='1d', start_date=None, end_date=None):
+def download_stock_database(fetcher, cache_mgr, symbols=None, force_refresh=False, interval='1d', start_date=None, end_date=None, max_workers=8, requests_per_second=2.0):
     """
     Download and cache stock data for multiple symbols.
 
@@ -28,6 +31,8 @@ def download_stock_database(fetcher, cache_mgr, symbols=None, force_refresh=Fals
         cache_mgr: CacheManager instance
         symbols: List of symbols to download (default: all 100 stocks)
         force_refresh: Force re-download even if cached
+        max_workers: Maximum number of downloads in flight at once
+        requests_per_second: Maximum rate at which downloads are started
     """
     if symbols is None:
         symbols = get_all_stocks()
@@ -41,34 +46,51 @@ def download_stock_database(fetcher, cache_mgr, symbols=None, force_refresh=Fals
     failed = 0
     skipped = 0
 
+    to_download = []
     for i, symbol in enumerate(symbols, 1):
         # Check if already cached
         if not force_refresh and cache_mgr.get_cached_symbol(symbol) is not None:
             print(f"[{i:3d}/{len(symbols)}] {symbol:6s} - Already cached (skipped)")
             skipped += 1
             continue
-
-        print(f"[{i:3d}/{len(symbols)}] {symbol:6s} - Downloading...", end=" ")
-
-        try:
-            df = fetcher.fetch_yahoo_historical(symbol, start_date=start_date, end_date=end_date, interval=interval, use_cache=False)
-
-            if not df.empty:
-                cache_mgr.save_cached_symbol(symbol, df)
-                print(f"✓ ({len(df)} rows)")
-                successful += 1
-            else:
-                print("✗ (No data)")
+        to_download.append((i, symbol))
+
+    # Space request starts at least min_interval apart across all worker threads
+    min_interval = 1.0 / requests_per_second if requests_per_second else 0.0
+    rate_lock = threading.Lock()
+    next_start = [time.monotonic()]
+
+    def fetch(symbol):
+        with rate_lock:
+            wait = next_start[0] - time.monotonic()
+            next_start[0] = max(next_start[0], time.monotonic()) + min_interval
+        if wait > 0:
+            time.sleep(wait)
+        return fetcher.fetch_yahoo_historical(symbol, start_date=start_date, end_date=end_date, interval=interval, use_cache=False)
+
+    # Downloads are network-bound, so a small thread pool overlaps them; fetch() paces
+    # how often they start. Results are cached on this thread as they arrive.
+    with ThreadPoolExecutor(max_workers=max_workers) as executor, cache_mgr.batch():
+        futures = {executor.submit(fetch, symbol): (i, symbol) for i, symbol in to_download}
+        for future in as_completed(futures):
+            i, symbol = futures[future]
+            print(f"[{i:3d}/{len(symbols)}] {symbol:6s} -", end=" ")
+
+            try:
+                df = future.result()
+
+                if not df.empty:
+                    cache_mgr.save_cached_symbol(symbol, df)
+                    print(f"✓ ({len(df)} rows)")
+                    successful += 1
+                else:
+                    print("✗ (No data)")
+                    failed += 1
+
+            except Exception as e:
+                print(f"✗ (Error: {str(e)[:40]})")
                 failed += 1
 
-        except Exception as e:
-            print(f"✗ (Error: {str(e)[:40]})")
-            failed += 1
-        finally:
-            # small delay to avoid aggressive request bursts
-            import time
-            time.sleep(0.5)
-
     print("\n" + "=" * 70)
     print(f"Results: {successful} successful, {failed} failed, {skipped} skipped")
     print("=" * 70)
@@ -65,10 +65,12 @@ def main(symbols=None, delay=0.6):
     total = len(symbols)
     print(f"Starting fetch for {total} symbols (daily 10y + available 1m). This may take a while.")
 
-    for i, s in enumerate(symbols, 1):
-        print(f"\n[{i}/{total}] Processing {s}")
-        fetch_for_symbol(fetcher, cache_mgr, s)
-        time.sleep(delay)
+    # Write the cache index once at the end rather than after every file
+    with cache_mgr.batch():
+        for i, s in enumerate(symbols, 1):
+            print(f"\n[{i}/{total}] Processing {s}")
+            fetch_for_symbol(fetcher, cache_mgr, s)
+            time.sleep(delay)
 
     print("\nFetch run complete. Use example.py to analyze cached data.")
 
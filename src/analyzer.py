@@ -9,6 +9,31 @@ import pandas as pd
 import numpy as np
 from typing import Tuple, Dict
 
+try:
+    from .indicators_njit import ema, macd, performance_stats, rolling_max, rolling_mean, rolling_mean_std, rolling_min, rolling_return_std, wilder_rsi
+except ImportError:  # imported as a top-level module with src/ on sys.path
+    from indicators_njit import ema, macd, performance_stats, rolling_max, rolling_mean, rolling_mean_std, rolling_min, rolling_return_std, wilder_rsi
+
+
+def _most_common(values: np.ndarray, num_points: int) -> list:
+    """
+    Return the ``num_points`` most frequent non-NaN values, most frequent first.
+
+    Ties are ordered by first occurrence, as ``value_counts()`` does. Only the
+    values that can make the cut are sorted, rather than the whole histogram.
+    """
+    values = values[~np.isnan(values)]
+    if num_points <= 0 or len(values) == 0:
+        return []
+    uniq, first, counts = np.unique(values, return_index=True, return_counts=True)
+    if num_points < len(counts):
+        kth = len(counts) - num_points
+        cutoff = np.partition(counts, kth)[kth]
+        keep = counts >= cutoff
+        uniq, first, counts = uniq[keep], first[keep], counts[keep]
+    order = np.lexsort((first, -counts))[:num_points]
+    return uniq[order].tolist()
+
 
 class StockAnalyzer:
     """Analyzes stock market data and generates insights."""
@@ -20,30 +45,30 @@ class StockAnalyzer:
         Args:
             df: DataFrame with columns: Date, Open, High, Low, Close, Volume
         """
-        self.df = df.copy()
-        self.df = self.df.sort_values('Date').reset_index(drop=True)
+        # The analyzer never mutates the frame, so an already sorted frame with a
+        # default index is used as-is; otherwise sorting produces the one copy.
+        if df['Date'].is_monotonic_increasing and df.index.equals(pd.RangeIndex(len(df))):
+            self.df = df
+        else:
+            self.df = df.sort_values('Date', ignore_index=True)
+        # Contiguous float64 Close buffer shared by the indicator kernels
+        self._close = np.ascontiguousarray(self.df['Close'].to_numpy(np.float64))
 
     def calculate_moving_average(self, window: int = 20) -> pd.Series:
         """Calculate simple moving average."""
-        return self.df['Close'].rolling(window=window).mean()
+        return pd.Series(rolling_mean(self._close, window), index=self.df.index)
 
     def calculate_exponential_moving_average(self, window: int = 20) -> pd.Series:
         """Calculate exponential moving average."""
-        return self.df['Close'].ewm(span=window, adjust=False).mean()
+        return pd.Series(ema(self._close, window), index=self.df.index)
 
     def calculate_rsi(self, window: int = 14) -> pd.Series:
         """
-        Calculate Relative Strength Index (RSI).
+        Calculate Relative Strength Index (RSI) using Wilder's smoothing.
 
         Returns values between 0 and 100.
         """
-        delta = self.df['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        return pd.Series(wilder_rsi(self._close, window), index=self.df.index)
 
     def calculate_macd(self, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[pd.Series, pd.Series]:
         """
@@ -52,11 +77,8 @@ class StockAnalyzer:
         Returns:
             Tuple of (MACD line, Signal line)
         """
-        ema_fast = self.df['Close'].ewm(span=fast, adjust=False).mean()
-        ema_slow = self.df['Close'].ewm(span=slow, adjust=False).mean()
-        macd = ema_fast - ema_slow
-        signal = macd.ewm(span=signal, adjust=False).mean()
-        return macd, signal
+        macd_line, signal_line = macd(self._close, fast, slow, signal)
+        return pd.Series(macd_line, index=self.df.index), pd.Series(signal_line, index=self.df.index)
 
     def calculate_bollinger_bands(self, window: int = 20, num_std: float = 2.0) -> Tuple[pd.Series, pd.Series, pd.Series]:
         """
@@ -65,33 +87,38 @@ class StockAnalyzer:
         Returns:
             Tuple of (Upper band, Middle band, Lower band)
         """
-        sma = self.df['Close'].rolling(window=window).mean()
-        std = self.df['Close'].rolling(window=window).std()
+        sma, std = rolling_mean_std(self._close, window)
         upper = sma + (std * num_std)
         lower = sma - (std * num_std)
-        return upper, sma, lower
+        index = self.df.index
+        return pd.Series(upper, index=index), pd.Series(sma, index=index), pd.Series(lower, index=index)
 
     def calculate_returns(self, period: int = 1) -> pd.Series:
         """Calculate percentage returns over specified period."""
-        return self.df['Close'].pct_change(periods=period) * 100
+        close = self._close
+        returns = np.full(len(close), np.nan)
+        if period < len(close):
+            with np.errstate(divide='ignore', invalid='ignore'):
+                returns[period:] = (close[period:] / close[:-period] - 1) * 100
+        return pd.Series(returns, index=self.df.index)
 
     def calculate_volatility(self, window: int = 20) -> pd.Series:
         """Calculate rolling volatility (standard deviation of returns)."""
-        returns = self.calculate_returns()
-        return returns.rolling(window=window).std()
+        return pd.Series(rolling_return_std(self._close, window), index=self.df.index)
 
     def get_performance_summary(self) -> Dict:
         """Get comprehensive performance metrics."""
-        close_prices = self.df['Close']
-        returns = self.calculate_returns()
+        first_price, current_price, max_price, min_price, mean_return, std_return = performance_stats(self._close)
 
-        total_return = ((close_prices.iloc[-1] - close_prices.iloc[0]) / close_prices.iloc[0]) * 100
-        annual_volatility = returns.std() * np.sqrt(252)  # Assuming 252 trading days
-        sharpe_ratio = (returns.mean() / returns.std()) * np.sqrt(252) if returns.std() > 0 else 0
+        total_return = ((current_price - first_price) / first_price) * 100
+        annual_volatility = std_return * np.sqrt(252)  # Assuming 252 trading days
+        sharpe_ratio = (mean_return / std_return) * np.sqrt(252) if std_return > 0 else 0
 
-        max_price = close_prices.max()
-        min_price = close_prices.min()
-        current_price = close_prices.iloc[-1]
+        dates = self.df['Date']
+        if dates.is_monotonic_increasing:
+            start_date, end_date = dates.iat[0], dates.iat[-1]
+        else:
+            start_date, end_date = dates.min(), dates.max()
 
         return {
             'total_return_pct': round(total_return, 2),
@@ -100,10 +127,10 @@ class StockAnalyzer:
             'max_price': round(max_price, 2),
             'min_price': round(min_price, 2),
             'current_price': round(current_price, 2),
-            'start_date': self.df['Date'].min(),
-            'end_date': self.df['Date'].max(),
+            'start_date': start_date,
+            'end_date': end_date,
             'trading_days': len(self.df),
-            'avg_daily_return_pct': round(returns.mean(), 4),
+            'avg_daily_return_pct': round(mean_return, 4),
         }
 
     def identify_trends(self, window: int = 50) -> Dict:
@@ -135,11 +162,8 @@ class StockAnalyzer:
             window: Window size for finding local extrema
             num_points: Number of top support/resistance levels to return
         """
-        highs = self.df['Close'].rolling(window=window).max()
-        lows = self.df['Close'].rolling(window=window).min()
-
-        resistance_levels = highs.value_counts().head(num_points).index.tolist()
-        support_levels = lows.value_counts().head(num_points).index.tolist()
+        resistance_levels = _most_common(rolling_max(self._close, window), num_points)
+        support_levels = _most_common(rolling_min(self._close, window), num_points)
 
         return {
             'resistance_levels': [round(x, 2) for x in resistance_levels],
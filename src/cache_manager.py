@@ -5,11 +5,63 @@ Provides functionality to manage a local database of stock data,
 reducing the need to re-download data frequently.
 """
 
+import glob
 import json
 import os
+import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard json module
+    orjson = None
+
+# Parquet write settings: zstd decompresses faster than the snappy default at a
+# similar ratio, and 50k-row groups give the Date statistics enough granularity
+# for tail reads to skip most of a 1-minute file.
+PARQUET_WRITE_OPTIONS = {
+    'compression': 'zstd',
+    'compression_level': 3,
+    'use_dictionary': True,
+    'data_page_size': 1 << 20,
+    'row_group_size': 50_000,
+}
+
+# Frequency suffixes get_cached_symbol probes for, in order of preference
+CACHE_FREQUENCIES = ('daily', '1m', '5m', '15m', '30m', '1h', '1wk', '1mo')
+
+# Price columns are stored as float32 to halve their size. This is a deliberate
+# precision trade-off: dividend-adjusted prices do not round-trip exactly and come
+# back with relative errors of up to ~1e-7. Readers cast back to float64 for
+# computation.
+PRICE_COLUMNS = ('Open', 'High', 'Low', 'Close', 'Adj Close')
+UINT32_MAX = np.iinfo(np.uint32).max
+
+
+def _date_range(dates: pd.Series) -> Tuple[str, str]:
+    """Return the first and last date as strings, reading the ends of an already sorted column."""
+    if len(dates) and dates.is_monotonic_increasing:
+        return str(dates.iat[0]), str(dates.iat[-1])
+    return str(dates.min()), str(dates.max())
+
+
+def _prepare_for_storage(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return a copy ready to write: Date as a timestamp column (time zone kept),
+    float32 prices and, when every value fits, uint32 Volume.
+    """
+    if 'Date' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['Date']):
+        df = df.assign(Date=pd.to_datetime(df['Date']))
+    dtypes = {c: 'float32' for c in PRICE_COLUMNS if c in df.columns}
+    if 'Volume' in df.columns:
+        volume = df['Volume']
+        if pd.api.types.is_numeric_dtype(volume) and volume.notna().all() and (len(volume) == 0 or (volume.min() >= 0 and volume.max() <= UINT32_MAX)):
+            dtypes['Volume'] = 'uint32'
+    return df.astype(dtypes) if dtypes else df
 
 
 class CacheManager:
@@ -27,11 +79,17 @@ class CacheManager:
         self.index_file = index_file
         os.makedirs(cache_dir, exist_ok=True)
         self.index = self._load_index()
+        # Index writes are deferred while inside batch()
+        self._batch_depth = 0
+        self._index_dirty = False
 
     def _load_index(self) -> Dict:
         """Load the cache index from file."""
         if os.path.exists(self.index_file):
             try:
+                if orjson is not None:
+                    with open(self.index_file, 'rb') as f:
+                        return orjson.loads(f.read())
                 with open(self.index_file, 'r') as f:
                     return json.load(f)
             except Exception as e:
@@ -40,65 +98,81 @@ class CacheManager:
         return {}
 
     def _save_index(self) -> None:
-        """Save the cache index to file."""
+        """Save the cache index to file (deferred to the end of an active batch)."""
+        if self._batch_depth:
+            self._index_dirty = True
+            return
         os.makedirs(os.path.dirname(self.index_file), exist_ok=True)
+        # Write a temporary file and swap it in so readers never see a partial index
+        tmp_file = self.index_file + '.tmp'
         try:
-            with open(self.index_file, 'w') as f:
-                json.dump(self.index, f, indent=2)
+            if orjson is not None:
+                with open(tmp_file, 'wb') as f:
+                    f.write(orjson.dumps(self.index, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+            else:
+                with open(tmp_file, 'w') as f:
+                    json.dump(self.index, f, indent=2)
+            os.replace(tmp_file, self.index_file)
         except Exception as e:
             print(f"Error saving index: {e}")
 
-    def get_cached_symbol(self, symbol: str) -> Optional[pd.DataFrame]:
+    @contextmanager
+    def batch(self):
+        """
+        Defer index writes until the block exits.
+
+        Saving many symbols inside ``with cache_mgr.batch():`` rewrites the
+        index once at the end instead of after every symbol.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._index_dirty:
+                self._index_dirty = False
+                self._save_index()
+
+    def get_cached_symbol(self, symbol: str, columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
         """
         Get cached data for a symbol. Prefer parquet if available.
 
         Args:
             symbol: Stock ticker symbol
+            columns: Only load these columns (those missing from the file are skipped).
+                Loads every column if None.
 
         Returns:
             DataFrame if cached, None otherwise
         """
-        # Look for parquet files with frequency suffixes first (e.g., SYMBOL_daily.parquet, SYMBOL_1m.parquet)
-        candidates = []
-        for fname in os.listdir(self.cache_dir):
-            if not fname.endswith('.parquet'):
-                continue
-            # match symbol or symbol_<freq>.parquet
-            if fname == f"{symbol}.parquet" or fname.startswith(f"{symbol}_") or fname.startswith(f"{symbol}."):
-                candidates.append(fname)
-
-        # Prefer a daily file if present
+        # Probe the usual file names directly, preferring the daily file
+        # (e.g., SYMBOL_daily.parquet, SYMBOL_1m.parquet, then SYMBOL.parquet)
         pref = None
-        for c in candidates:
-            if c.startswith(f"{symbol}_daily"):
-                pref = c
+        for suffix in [f"_{freq}" for freq in CACHE_FREQUENCIES] + ['']:
+            fname = f"{symbol}{suffix}.parquet"
+            if os.path.exists(os.path.join(self.cache_dir, fname)):
+                pref = fname
                 break
-        if pref is None and candidates:
-            pref = candidates[0]
+
+        # Fall back to any other SYMBOL_<freq>.parquet or SYMBOL.<suffix>.parquet
+        if pref is None:
+            pattern = os.path.join(glob.escape(self.cache_dir), glob.escape(symbol))
+            matches = glob.glob(f"{pattern}_*.parquet") + glob.glob(f"{pattern}.*.parquet")
+            if matches:
+                pref = os.path.basename(matches[0])
 
         if pref:
             parquet_file = os.path.join(self.cache_dir, pref)
             try:
-                df = pd.read_parquet(parquet_file)
-                if 'Date' in df.columns:
-                    df['Date'] = pd.to_datetime(df['Date'])
-                return df
+                if columns is not None:
+                    available = pq.read_schema(parquet_file).names
+                    columns = [c for c in columns if c in available]
+                # Date is written as a timestamp column, so it needs no conversion here
+                return pd.read_parquet(parquet_file, columns=columns, memory_map=True)
             except Exception as e:
                 print(f"Error reading parquet cache for {symbol}: {e}")
                 return None
 
-        # Legacy CSV fallback (if any CSVs remain)
-        cache_file = os.path.join(self.cache_dir, f"{symbol}.csv")
-        if os.path.exists(cache_file):
-            try:
-                df = pd.read_csv(cache_file)
-                if 'Date' in df.columns:
-                    df['Date'] = pd.to_datetime(df['Date'])
-                return df
-            except Exception as e:
-                print(f"Error reading cache for {symbol}: {e}")
-                return None
-
         return None
 
     def save_cached_symbol(self, symbol: str, df: pd.DataFrame, freq: str = 'daily') -> bool:
@@ -116,15 +190,14 @@ class CacheManager:
             
             os.makedirs(self.cache_dir, exist_ok=True)
             parquet_file = os.path.join(self.cache_dir, f"{symbol}_{freq}.parquet")
-            df.to_parquet(parquet_file, index=False)
+            _prepare_for_storage(df).to_parquet(parquet_file, index=False, **PARQUET_WRITE_OPTIONS)
 
             key = f"{symbol}_{freq}"
             # Handle Date column safely
             start_date = None
             end_date = None
             if 'Date' in df.columns:
-                start_date = str(df['Date'].min())
-                end_date = str(df['Date'].max())
+                start_date, end_date = _date_range(df['Date'])
             
             self.index[key] = {
                 'cached_date': datetime.now().isoformat(),
@@ -150,14 +223,15 @@ class CacheManager:
         try:
             os.makedirs(self.cache_dir, exist_ok=True)
             parquet_file = os.path.join(self.cache_dir, f"{symbol}_{freq}.parquet")
-            df.to_parquet(parquet_file, index=False)
+            _prepare_for_storage(df).to_parquet(parquet_file, index=False, **PARQUET_WRITE_OPTIONS)
 
             key = f"{symbol}_{freq}"
+            start_date, end_date = _date_range(df['Date'])
             self.index[key] = {
                 'cached_date': datetime.now().isoformat(),
                 'rows': len(df),
-                'start_date': str(df['Date'].min()),
-                'end_date': str(df['Date'].max()),
+                'start_date': start_date,
+                'end_date': end_date,
                 'parquet': os.path.basename(parquet_file),
             }
             self._save_index()
@@ -170,17 +244,16 @@ class CacheManager:
     def get_cached_symbols(self) -> List[str]:
         """Get list of all cached symbols."""
         symbols = set()
-        for filename in os.listdir(self.cache_dir):
-            if filename.endswith('.parquet'):
-                # strip suffix like _daily or _1m
-                base = filename.rsplit('.', 1)[0]
-                if '_' in base:
-                    base_sym = base.split('_', 1)[0]
-                else:
-                    base_sym = base
-                symbols.add(base_sym)
-            elif filename.endswith('.csv'):
-                symbols.add(filename.replace('.csv', ''))
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith('.parquet'):
+                    # strip suffix like _daily or _1m
+                    base = entry.name.rsplit('.', 1)[0]
+                    if '_' in base:
+                        base_sym = base.split('_', 1)[0]
+                    else:
+                        base_sym = base
+                    symbols.add(base_sym)
         return sorted(symbols)
 
     def get_cache_info(self, symbol: str) -> Optional[Dict]:
@@ -204,13 +277,14 @@ class CacheManager:
             symbol: If provided, clear only this symbol. Otherwise clear all.
         """
         if symbol:
-            # remove any parquet or csv for this symbol
-            for fname in os.listdir(self.cache_dir):
-                if fname.startswith(f"{symbol}") and (fname.endswith('.csv') or fname.endswith('.parquet')):
-                    try:
-                        os.remove(os.path.join(self.cache_dir, fname))
-                    except Exception:
-                        pass
+            # remove any parquet for this symbol
+            with os.scandir(self.cache_dir) as it:
+                paths = [e.path for e in it if e.name.startswith(f"{symbol}") and e.name.endswith('.parquet')]
+            for path in paths:
+                try:
+                    os.remove(path)
+                except Exception:
+                    pass
             # remove index entries for this symbol
             keys = [k for k in list(self.index.keys()) if k == symbol or k.startswith(f"{symbol}_")]
             for k in keys:
@@ -218,12 +292,13 @@ class CacheManager:
             self._save_index()
             print(f"Cleared cache for {symbol}")
         else:
-            for fname in os.listdir(self.cache_dir):
-                if fname.endswith('.csv') or fname.endswith('.parquet'):
-                    try:
-                        os.remove(os.path.join(self.cache_dir, fname))
-                    except Exception:
-                        pass
+            with os.scandir(self.cache_dir) as it:
+                paths = [e.path for e in it if e.name.endswith('.parquet')]
+            for path in paths:
+                try:
+                    os.remove(path)
+                except Exception:
+                    pass
             self.index = {}
             self._save_index()
             print("Cleared all cache")
@@ -234,13 +309,13 @@ class CacheManager:
         total_rows = 0
         total_size = 0
 
-        for symbol in symbols:
-            cache_file = os.path.join(self.cache_dir, f"{symbol}.csv")
-            if os.path.exists(cache_file):
-                total_size += os.path.getsize(cache_file)
-                info = self.get_cache_info(symbol)
-                if info:
-                    total_rows += info.get('rows', 0)
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith('.parquet'):
+                    total_size += entry.stat().st_size
+                    info = self.index.get(entry.name[:-len('.parquet')])
+                    if info:
+                        total_rows += info.get('rows', 0)
 
         return {
             'total_symbols': len(symbols),
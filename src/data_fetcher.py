@@ -7,9 +7,32 @@ from free public sources using yfinance library.
 
 import yfinance as yf
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List
-import time
+from typing import Optional, Dict, List, Tuple, Union
+
+
+def _resolve_dates(start_date: Optional[Union[str, datetime]], end_date: Optional[Union[str, datetime]]) -> Tuple[datetime, datetime]:
+    """
+    Turn optional start/end dates (strings or datetimes) into naive local datetimes,
+    defaulting to the year up to today. Time-zone aware values are converted to
+    local wall time so both ends can be compared and subtracted.
+    """
+    def to_datetime(value) -> datetime:
+        dt = value if isinstance(value, datetime) else pd.Timestamp(value).to_pydatetime()
+        return dt.astimezone().replace(tzinfo=None) if dt.tzinfo is not None else dt
+
+    if end_date:
+        end_dt = to_datetime(end_date)
+    else:
+        end_dt = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    if start_date:
+        start_dt = to_datetime(start_date)
+    else:
+        start_dt = end_dt - timedelta(days=365)
+    return start_dt, end_dt
 
 
 class StockDataFetcher:
@@ -27,8 +50,8 @@ class StockDataFetcher:
     def fetch_yahoo_historical(
         self,
         symbol: str,
-        start_date: Optional[str] = None,
-        end_date: Optional[str] = None,
+        start_date: Optional[Union[str, datetime]] = None,
+        end_date: Optional[Union[str, datetime]] = None,
         interval: str = "1d",
         use_cache: bool = True
     ) -> pd.DataFrame:
@@ -37,29 +60,26 @@ class StockDataFetcher:
 
         Args:
             symbol: Stock ticker symbol (e.g., 'AAPL')
-            start_date: Start date in YYYY-MM-DD format (default: 1 year ago)
-            end_date: End date in YYYY-MM-DD format (default: today)
+            start_date: Start date in YYYY-MM-DD format or a datetime (default: 1 year ago)
+            end_date: End date in YYYY-MM-DD format or a datetime (default: today)
             interval: Data interval - '1d', '1wk', '1mo'
             use_cache: Try to load from cache first if True
 
         Returns:
             DataFrame with columns: Date, Open, High, Low, Close, Volume, Adj Close
         """
-        if not start_date:
-            start_date = (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
-        if not end_date:
-            end_date = datetime.now().strftime('%Y-%m-%d')
+        try:
+            start_dt, end_dt = _resolve_dates(start_date, end_date)
+        except ValueError as e:
+            print(f"Invalid date range for {symbol}: {e}")
+            return pd.DataFrame()
 
         # Try loading from cache first
         if use_cache:
-            cached_df = self._load_from_cache(symbol)
-            if cached_df is not None and len(cached_df) > 0:
-                # Filter by date range if requested
-                if start_date and end_date:
-                    cached_df = cached_df[
-                        (cached_df['Date'] >= start_date) & 
-                        (cached_df['Date'] <= end_date)
-                    ]
+            # A cache with no rows in the window is still a hit; downloading would
+            # overwrite the cached history with just this window
+            cached_df = self._load_from_cache(symbol, start_dt, end_dt)
+            if cached_df is not None:
                 return cached_df
         
         # Handle minute-level interval limits
@@ -68,25 +88,17 @@ class StockDataFetcher:
             # yfinance / Yahoo generally only provides very short-term minute data for free.
             # We'll enforce conservative limits to avoid large, impossible requests.
             max_days = minute_intervals.get(interval, 7)
-            try:
-                start_dt = datetime.strptime(start_date, '%Y-%m-%d') if start_date else datetime.now() - timedelta(days=max_days)
-                end_dt = datetime.strptime(end_date, '%Y-%m-%d') if end_date else datetime.now()
-            except Exception:
-                start_dt = datetime.now() - timedelta(days=max_days)
-                end_dt = datetime.now()
-
             delta_days = (end_dt - start_dt).days
             if delta_days > max_days:
                 # Truncate the range to the maximum allowed for minute data
-                new_start = end_dt - timedelta(days=max_days)
-                print(f"Requested minute-level range ({delta_days} days) exceeds available limit for '{interval}'. Truncating to last {max_days} days: {new_start.date()} -> {end_dt.date()}")
-                start_date = new_start.strftime('%Y-%m-%d')
+                start_dt = end_dt - timedelta(days=max_days)
+                print(f"Requested minute-level range ({delta_days} days) exceeds available limit for '{interval}'. Truncating to last {max_days} days: {start_dt.date()} -> {end_dt.date()}")
                 # proceed with truncated dates
 
         try:
             # Use yfinance to fetch data
             ticker = yf.Ticker(symbol)
-            df = ticker.history(start=start_date, end=end_date, interval=interval)
+            df = ticker.history(start=start_dt, end=end_dt, interval=interval)
 
             if df.empty:
                 print(f"No data retrieved for {symbol}")
@@ -120,33 +132,80 @@ class StockDataFetcher:
     def fetch_multiple_symbols(
         self,
         symbols: List[str],
-        start_date: Optional[str] = None,
-        end_date: Optional[str] = None,
+        start_date: Optional[Union[str, datetime]] = None,
+        end_date: Optional[Union[str, datetime]] = None,
         use_cache: bool = True
     ) -> Dict[str, pd.DataFrame]:
         """
-        Fetch historical data for multiple symbols with rate limiting.
+        Fetch historical data for multiple symbols.
+
+        Cached symbols are loaded from disk; the rest are downloaded together
+        in one threaded ``yf.download`` call.
 
         Args:
             symbols: List of stock ticker symbols
-            start_date: Start date in YYYY-MM-DD format
-            end_date: End date in YYYY-MM-DD format
+            start_date: Start date in YYYY-MM-DD format or a datetime
+            end_date: End date in YYYY-MM-DD format or a datetime
             use_cache: Use cached data if available
 
         Returns:
             Dictionary mapping symbol to DataFrame
         """
-        data = {}
-        for i, symbol in enumerate(symbols):
-            print(f"[{i+1}/{len(symbols)}] Fetching data for {symbol}...")
-            df = self.fetch_yahoo_historical(symbol, start_date, end_date, use_cache=use_cache)
-            data[symbol] = df
+        try:
+            start_dt, end_dt = _resolve_dates(start_date, end_date)
+        except ValueError as e:
+            print(f"Invalid date range: {e}")
+            return {symbol: pd.DataFrame() for symbol in symbols}
 
-            # Rate limiting: wait 0.5 seconds between requests
-            if i < len(symbols) - 1:
-                time.sleep(0.5)
+        data = {}
+        if use_cache:
+            import os
+            cached = [(i, symbol) for i, symbol in enumerate(symbols)
+                      if os.path.exists(os.path.join(self.cache_dir, f"{symbol}.parquet"))]
+            if cached:
+                # Parquet reads are IO-bound and pyarrow releases the GIL while decoding,
+                # so cached symbols load concurrently
+                with ThreadPoolExecutor(max_workers=min(16, len(cached))) as executor:
+                    frames = executor.map(lambda item: self._load_from_cache(item[1], start_dt, end_dt), cached)
+                    for (i, symbol), cached_df in zip(cached, frames):
+                        if cached_df is not None:
+                            print(f"[{i+1}/{len(symbols)}] Loaded {symbol} from cache")
+                            data[symbol] = cached_df
+        missing = [symbol for symbol in symbols if symbol not in data]
+
+        downloaded = {}
+        if missing:
+            print(f"Fetching data for {len(missing)} symbols...")
+            try:
+                raw = yf.download(missing, start=start_dt, end=end_dt, group_by='ticker', threads=True, progress=False)
+            except Exception as e:
+                print(f"Error fetching data: {e}")
+                raw = pd.DataFrame()
+
+            for symbol in missing:
+                if raw.empty:
+                    df = pd.DataFrame()
+                elif isinstance(raw.columns, pd.MultiIndex):
+                    df = raw[symbol] if symbol in raw.columns.get_level_values(0) else pd.DataFrame()
+                else:
+                    df = raw
+                df = df.dropna(how='all')
+
+                if df.empty:
+                    print(f"No data retrieved for {symbol}")
+                    downloaded[symbol] = pd.DataFrame()
+                    continue
+
+                df = df.reset_index().rename(columns={'Datetime': 'Date'})
+                df.columns.name = None
+                df['Date'] = pd.to_datetime(df['Date'])
+                df = df.sort_values('Date')
+                if use_cache:
+                    self._save_to_cache(df, symbol)
+                downloaded[symbol] = df
 
-        return data
+        # Keep the caller's symbol order
+        return {symbol: data[symbol] if symbol in data else downloaded[symbol] for symbol in symbols}
 
     def get_current_quote(self, symbol: str) -> Optional[Dict]:
         """
@@ -181,36 +240,66 @@ class StockDataFetcher:
         """Save DataFrame to cache file."""
         import os
         os.makedirs(self.cache_dir, exist_ok=True)
-        cache_file = os.path.join(self.cache_dir, f"{symbol}.csv")
-        df.to_csv(cache_file, index=False)
+        cache_file = os.path.join(self.cache_dir, f"{symbol}.parquet")
+        self.save_to_parquet(df, cache_file)
+
+    def _load_from_cache(self, symbol: str, start: Optional[Union[str, datetime]] = None, end: Optional[Union[str, datetime]] = None) -> Optional[pd.DataFrame]:
+        """
+        Load DataFrame from cache file.
+
+        Args:
+            symbol: Stock ticker symbol
+            start: Only load rows dated on or after this date (YYYY-MM-DD or datetime)
+            end: Only load rows dated on or before this date (YYYY-MM-DD or datetime)
 
-    def _load_from_cache(self, symbol: str) -> Optional[pd.DataFrame]:
-        """Load DataFrame from cache file."""
+        Returns:
+            The cached rows in the date range (possibly none), or None if the
+            symbol has no cached data
+        """
         import os
-        cache_file = os.path.join(self.cache_dir, f"{symbol}.csv")
+        cache_file = os.path.join(self.cache_dir, f"{symbol}.parquet")
 
         if os.path.exists(cache_file):
             try:
-                df = pd.read_csv(cache_file)
-                df['Date'] = pd.to_datetime(df['Date'])
-                return df
+                if pq.read_metadata(cache_file).num_rows == 0:
+                    return None
+                return self.load_from_parquet(cache_file, start, end)
             except Exception as e:
                 print(f"Error loading cache for {symbol}: {e}")
                 return None
         return None
 
-    def save_to_csv(self, df: pd.DataFrame, filename: str) -> None:
-        """Save DataFrame to CSV file."""
+    def save_to_parquet(self, df: pd.DataFrame, filename: str) -> None:
+        """Save DataFrame to a zstd-compressed Parquet file."""
         import os
         os.makedirs(os.path.dirname(filename) if os.path.dirname(filename) else '.', exist_ok=True)
-        df.to_csv(filename, index=False)
-        print(f"Data saved to {filename}")
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        pq.write_table(table, filename, compression='zstd', use_dictionary=True)
 
-    def load_from_csv(self, filename: str) -> pd.DataFrame:
-        """Load DataFrame from CSV file."""
-        df = pd.read_csv(filename)
-        df['Date'] = pd.to_datetime(df['Date'])
-        return df
+    def load_from_parquet(self, filename: str, start: Optional[Union[str, datetime]] = None, end: Optional[Union[str, datetime]] = None) -> pd.DataFrame:
+        """
+        Load DataFrame from Parquet file (Date is stored as a timestamp).
+
+        The optional date bounds are pushed down into the read, so row groups
+        outside the range are skipped using the file's Date statistics.
+        """
+        filters = None
+        if start or end:
+            date_type = pq.read_schema(filename).field('Date').type
+            bounds = []
+            for op, value in (('>=', start), ('<=', end)):
+                if value:
+                    if pa.types.is_timestamp(date_type):
+                        # Compare in the column's own type; pyarrow rejects mixed time zones
+                        ts = pd.Timestamp(value)
+                        if date_type.tz:
+                            ts = ts.tz_localize(date_type.tz) if ts.tzinfo is None else ts.tz_convert(date_type.tz)
+                        elif ts.tzinfo is not None:
+                            ts = ts.tz_convert(None)
+                        value = pa.scalar(ts, type=date_type)
+                    bounds.append(('Date', op, value))
+            filters = bounds
+        return pq.read_table(filename, filters=filters, memory_map=True).to_pandas()
 
     def clear_cache(self, symbol: Optional[str] = None) -> None:
         """
@@ -223,12 +312,14 @@ class StockDataFetcher:
         import glob
 
         if symbol:
-            cache_file = os.path.join(self.cache_dir, f"{symbol}.csv")
+            cache_file = os.path.join(self.cache_dir, f"{symbol}.parquet")
             if os.path.exists(cache_file):
                 os.remove(cache_file)
                 print(f"Cleared cache for {symbol}")
         else:
-            cache_files = glob.glob(os.path.join(self.cache_dir, "*.csv"))
+            cache_files = glob.glob(os.path.join(self.cache_dir, "*.parquet"))
             for f in cache_files:
-                os.remove(f)
+                # Leave CacheManager's SYMBOL_<freq>.parquet files in the shared directory alone
+                if '_' not in os.path.basename(f):
+                    os.remove(f)
             print(f"Cleared cache for all stocks")
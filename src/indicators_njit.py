@@ -0,0 +1,469 @@
+"""
+Compiled indicator kernels.
+
+Single-pass implementations of the technical indicators used by the
+backtest and the analyzer, compiled with numba when it is available.
+Without numba the same functions run as plain Python loops, which is
+slower but gives identical results.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that returns the function unchanged."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
+
+
+@njit(cache=True)
+def wilder_rsi_step(delta, i, period, avg_gain, avg_loss):
+    """
+    Update Wilder's average gain and loss with the price move into bar ``i``.
+
+    The averages are seeded with the simple mean of the first ``period``
+    moves (complete at ``i == period``) and then smoothed as
+    ``avg = (avg * (period - 1) + move) / period``, the same recursion as
+    pandas ``ewm(alpha=1 / period, adjust=False)``. A NaN move counts as no
+    move. Before bar ``period`` the returned values are running sums.
+
+    Returns:
+        Tuple of (average gain, average loss)
+    """
+    gain = delta if delta > 0 else 0.0
+    loss = -delta if delta < 0 else 0.0
+    if i < period:
+        return avg_gain + gain, avg_loss + loss
+    if i == period:
+        return (avg_gain + gain) / period, (avg_loss + loss) / period
+    return (avg_gain * (period - 1) + gain) / period, (avg_loss * (period - 1) + loss) / period
+
+
+@njit(cache=True)
+def rsi_from_averages(avg_gain, avg_loss):
+    """Convert average gain and loss to RSI (NaN when prices did not move)."""
+    if avg_loss > 0:
+        return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    if avg_gain > 0:
+        return 100.0
+    return np.nan
+
+
+@njit(cache=True)
+def wilder_rsi(close, period=14):
+    """
+    Calculate RSI with Wilder's smoothing in one pass over Close.
+
+    Missing deltas count as no move and the first ``period`` values are NaN.
+
+    Args:
+        close: float64 array of closing prices
+        period: Number of bars averaged for gains and losses
+
+    Returns:
+        float64 array of RSI values between 0 and 100
+    """
+    n = len(close)
+    rsi = np.full(n, np.nan)
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, n):
+        avg_gain, avg_loss = wilder_rsi_step(close[i] - close[i - 1], i, period, avg_gain, avg_loss)
+        if i >= period:
+            rsi[i] = rsi_from_averages(avg_gain, avg_loss)
+    return rsi
+
+
+@njit(cache=True)
+def ema_step(x, alpha, ema, old_wt):
+    """
+    Fold ``x`` into an exponential moving average.
+
+    Reproduces pandas 3.0 ``ewm(alpha=alpha, adjust=False).mean()`` exactly.
+    A NaN leaves the average unchanged but its weight keeps decaying, so the
+    next value counts for more: with ``alpha = 1/3`` the average of
+    ``[1, 2, nan, 4]`` ends at 2.4762 (``[1, 2, 4]`` gives 2.2222). For
+    ``alpha = 0.5`` (``com == 1``) pandas gives the new value a weight of
+    ``1 - old_wt`` instead of ``alpha``, so ``[1, 2, nan, 4]`` ends at 3.375.
+    Start with ``ema = nan`` and ``old_wt = 1.0``.
+
+    Returns:
+        Tuple of (updated average, updated weight of the previous average)
+    """
+    if ema != ema:
+        return x, old_wt
+    old_wt *= 1.0 - alpha
+    if x == x:
+        new_wt = 1.0 - old_wt if alpha == 0.5 else alpha
+        if ema != x:
+            ema = (old_wt * ema + new_wt * x) / (old_wt + new_wt)
+        old_wt = 1.0
+    return ema, old_wt
+
+
+@njit(cache=True)
+def span_alpha(span):
+    """Smoothing factor for an EMA span, derived via the center of mass as pandas does."""
+    return 1.0 / (1.0 + (span - 1.0) / 2.0)
+
+
+@njit(cache=True)
+def ema(close, span):
+    """
+    Calculate an exponential moving average of Close in one pass.
+
+    Matches pandas ``ewm(span=span, adjust=False).mean()`` (see ``ema_step``).
+    """
+    n = len(close)
+    out = np.empty(n)
+    alpha = span_alpha(span)
+    value = np.nan
+    weight = 1.0
+    for i in range(n):
+        value, weight = ema_step(close[i], alpha, value, weight)
+        out[i] = value
+    return out
+
+
+@njit(cache=True)
+def macd(close, fast=12, slow=26, signal=9):
+    """
+    Calculate the MACD line and its signal line in one pass over Close.
+
+    Each average matches pandas ``ewm(span=..., adjust=False).mean()``
+    (see ``ema_step``).
+
+    Returns:
+        Tuple of float64 arrays (MACD line, signal line)
+    """
+    n = len(close)
+    macd_line = np.empty(n)
+    signal_line = np.empty(n)
+    alpha_fast = span_alpha(fast)
+    alpha_slow = span_alpha(slow)
+    alpha_signal = span_alpha(signal)
+    ema_fast = np.nan
+    ema_slow = np.nan
+    ema_signal = np.nan
+    wt_fast = 1.0
+    wt_slow = 1.0
+    wt_signal = 1.0
+    for i in range(n):
+        x = close[i]
+        ema_fast, wt_fast = ema_step(x, alpha_fast, ema_fast, wt_fast)
+        ema_slow, wt_slow = ema_step(x, alpha_slow, ema_slow, wt_slow)
+        diff = ema_fast - ema_slow
+        ema_signal, wt_signal = ema_step(diff, alpha_signal, ema_signal, wt_signal)
+        macd_line[i] = diff
+        signal_line[i] = ema_signal
+    return macd_line, signal_line
+
+
+@njit(cache=True)
+def rolling_mean(values, window):
+    """
+    Calculate a trailing mean with a running update.
+
+    Follows pandas ``rolling(window)`` semantics: values are NaN until the
+    window is full or while it contains a NaN.
+
+    Returns:
+        Float64 array of rolling means
+    """
+    n = len(values)
+    mean = np.full(n, np.nan)
+    count = 0
+    nans = 0
+    running_mean = 0.0
+    for i in range(n):
+        # Drop the outgoing value before adding the new one, so a window that
+        # empties resets exactly (window=1 returns the values unchanged)
+        if i >= window:
+            old = values[i - window]
+            if np.isnan(old):
+                nans -= 1
+            else:
+                count -= 1
+                if count == 0:
+                    running_mean = 0.0
+                else:
+                    running_mean -= (old - running_mean) / count
+        x = values[i]
+        if np.isnan(x):
+            nans += 1
+        else:
+            count += 1
+            running_mean += (x - running_mean) / count
+        if i >= window - 1 and nans == 0:
+            mean[i] = running_mean
+    return mean
+
+
+@njit(cache=True)
+def rolling_mean_std(values, window):
+    """
+    Calculate a trailing mean and sample std (ddof=1) in one pass.
+
+    Follows pandas ``rolling(window)`` semantics: values are NaN until the
+    window is full or while it contains a NaN.
+
+    Returns:
+        Tuple of float64 arrays (rolling mean, rolling std)
+    """
+    n = len(values)
+    mean = np.full(n, np.nan)
+    std = np.full(n, np.nan)
+    count = 0
+    nans = 0
+    running_mean = 0.0
+    m2 = 0.0
+    for i in range(n):
+        x = values[i]
+        if np.isnan(x):
+            nans += 1
+        else:
+            count += 1
+            delta = x - running_mean
+            running_mean += delta / count
+            m2 += delta * (x - running_mean)
+        if i >= window:
+            old = values[i - window]
+            if np.isnan(old):
+                nans -= 1
+            else:
+                count -= 1
+                if count == 0:
+                    running_mean = 0.0
+                    m2 = 0.0
+                else:
+                    delta = old - running_mean
+                    running_mean -= delta / count
+                    m2 -= delta * (old - running_mean)
+        if i >= window - 1 and nans == 0:
+            mean[i] = running_mean
+            if window > 1:
+                std[i] = np.sqrt(max(m2, 0.0) / (window - 1))
+    return mean, std
+
+
+@njit(cache=True)
+def rolling_extreme(values, window, find_max):
+    """
+    Calculate a trailing max (or min) in O(n) with a monotonic deque.
+
+    The deque holds indices whose values are decreasing (increasing for a
+    min), so its head is always the extreme of the current window. Follows
+    pandas ``rolling(window)`` semantics: values are NaN until the window is
+    full or while it contains a NaN.
+    """
+    n = len(values)
+    out = np.full(n, np.nan)
+    deque = np.empty(n, np.int64)
+    head = 0
+    tail = 0
+    nans = 0
+    for i in range(n):
+        x = values[i]
+        if np.isnan(x):
+            nans += 1
+        else:
+            while tail > head and (values[deque[tail - 1]] <= x if find_max else values[deque[tail - 1]] >= x):
+                tail -= 1
+            deque[tail] = i
+            tail += 1
+        if i >= window:
+            if np.isnan(values[i - window]):
+                nans -= 1
+            if tail > head and deque[head] <= i - window:
+                head += 1
+        if i >= window - 1 and nans == 0:
+            out[i] = values[deque[head]]
+    return out
+
+
+@njit(cache=True)
+def rolling_max(values, window):
+    """Trailing max over ``window`` values (see ``rolling_extreme``)."""
+    return rolling_extreme(values, window, True)
+
+
+@njit(cache=True)
+def rolling_min(values, window):
+    """Trailing min over ``window`` values (see ``rolling_extreme``)."""
+    return rolling_extreme(values, window, False)
+
+
+@njit(cache=True)
+def rolling_return_std(close, window):
+    """
+    Calculate the rolling sample std (ddof=1) of 1-bar percentage returns.
+
+    Returns are computed on the fly and kept in a ring buffer of ``window``
+    values, so no returns array is materialised. Matches
+    ``pct_change() * 100`` followed by ``rolling(window).std()``: the first
+    return is NaN, and a window containing a NaN return yields NaN.
+    """
+    n = len(close)
+    out = np.full(n, np.nan)
+    ring = np.full(window, np.nan)
+    count = 0
+    nans = 0
+    mean = 0.0
+    m2 = 0.0
+    for i in range(n):
+        r = (close[i] / close[i - 1] - 1) * 100 if i > 0 else np.nan
+        if np.isnan(r):
+            nans += 1
+        else:
+            count += 1
+            delta = r - mean
+            mean += delta / count
+            m2 += delta * (r - mean)
+        if i >= window:
+            old = ring[i % window]
+            if np.isnan(old):
+                nans -= 1
+            else:
+                count -= 1
+                if count == 0:
+                    mean = 0.0
+                    m2 = 0.0
+                else:
+                    delta = old - mean
+                    mean -= delta / count
+                    m2 -= delta * (old - mean)
+        ring[i % window] = r
+        if i >= window - 1 and nans == 0 and window > 1:
+            out[i] = np.sqrt(max(m2, 0.0) / (window - 1))
+    return out
+
+
+@njit(cache=True)
+def performance_stats(close):
+    """
+    Summarise a Close series and its 1-bar percentage returns in one pass.
+
+    NaNs are skipped like pandas reductions skip them; the return mean and
+    sample std (ddof=1) use Welford's update.
+
+    Returns:
+        Tuple of (first close, last close, max close, min close,
+        mean return %, std of returns %)
+    """
+    n = len(close)
+    if n == 0:
+        return np.nan, np.nan, np.nan, np.nan, np.nan, np.nan
+    max_close = np.nan
+    min_close = np.nan
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    for i in range(n):
+        x = close[i]
+        if not np.isnan(x):
+            if np.isnan(max_close) or x > max_close:
+                max_close = x
+            if np.isnan(min_close) or x < min_close:
+                min_close = x
+        if i > 0:
+            r = (x / close[i - 1] - 1) * 100
+            if not np.isnan(r):
+                count += 1
+                delta = r - mean
+                mean += delta / count
+                m2 += delta * (r - mean)
+    mean_return = mean if count > 0 else np.nan
+    std_return = np.sqrt(m2 / (count - 1)) if count > 1 else np.nan
+    return close[0], close[-1], max_close, min_close, mean_return, std_return
+
+
+@njit(cache=True)
+def compute_indicators(close, sma_period=5, trend_period=20, rsi_period=14):
+    """
+    Calculate the backtest's 1-minute indicators in a single pass over Close.
+
+    Rolling windows follow pandas ``rolling(window)`` semantics: a value is NaN
+    until the window is full or while it contains a NaN. RSI uses Wilder's
+    smoothing (see ``wilder_rsi_step``); missing deltas count as no move and
+    the first ``rsi_period`` values are NaN.
+
+    Args:
+        close: float64 array of closing prices
+        sma_period: Window of the short simple moving average
+        trend_period: Window of the long moving average and the volatility
+        rsi_period: Number of bars averaged for RSI gains and losses
+
+    Returns:
+        Tuple of float64 arrays (short SMA, long SMA, rolling std, RSI)
+    """
+    n = len(close)
+    sma_short = np.full(n, np.nan)
+    sma_long = np.full(n, np.nan)
+    volatility = np.full(n, np.nan)
+    rsi = np.full(n, np.nan)
+
+    # Short SMA: running sum and NaN count over the window
+    short_sum = 0.0
+    short_nans = 0
+    # Long SMA and std: running mean/M2 updates (as pandas rolling var does)
+    long_count = 0
+    long_nans = 0
+    long_mean = 0.0
+    long_m2 = 0.0
+    # RSI: Wilder-smoothed average gain and loss
+    avg_gain = 0.0
+    avg_loss = 0.0
+
+    for i in range(n):
+        x = close[i]
+
+        if np.isnan(x):
+            short_nans += 1
+        else:
+            short_sum += x
+        if i >= sma_period:
+            old = close[i - sma_period]
+            if np.isnan(old):
+                short_nans -= 1
+            else:
+                short_sum -= old
+        if i >= sma_period - 1 and short_nans == 0:
+            sma_short[i] = short_sum / sma_period
+
+        if np.isnan(x):
+            long_nans += 1
+        else:
+            long_count += 1
+            delta = x - long_mean
+            long_mean += delta / long_count
+            long_m2 += delta * (x - long_mean)
+        if i >= trend_period:
+            old = close[i - trend_period]
+            if np.isnan(old):
+                long_nans -= 1
+            else:
+                long_count -= 1
+                if long_count == 0:
+                    long_mean = 0.0
+                    long_m2 = 0.0
+                else:
+                    delta = old - long_mean
+                    long_mean -= delta / long_count
+                    long_m2 -= delta * (old - long_mean)
+        if i >= trend_period - 1 and long_nans == 0:
+            sma_long[i] = long_mean
+            if trend_period > 1:
+                volatility[i] = np.sqrt(max(long_m2, 0.0) / (trend_period - 1))
+
+        if i > 0:
+            avg_gain, avg_loss = wilder_rsi_step(x - close[i - 1], i, rsi_period, avg_gain, avg_loss)
+            if i >= rsi_period:
+                rsi[i] = rsi_from_averages(avg_gain, avg_loss)
+
+    return sma_short, sma_long, volatility, rsi
@@ -6,7 +6,7 @@ commonly used for market analysis and portfolio building.
 """
 
 # S&P 500 Tech Giants and Mega-Cap Stocks
-MEGA_CAP = [
+MEGA_CAP = (
     'AAPL',  # Apple
     'MSFT',  # Microsoft
     'GOOGL', # Alphabet (Google)
@@ -15,10 +15,10 @@ MEGA_CAP = [
     'META',  # Meta Platforms
     'TSLA',  # Tesla
     'BRK.B', # Berkshire Hathaway
-]
+)
 
 # Large Tech Companies
-LARGE_TECH = [
+LARGE_TECH = (
     'NFLX',  # Netflix
     'ADBE',  # Adobe
     'INTC',  # Intel
@@ -31,10 +31,10 @@ LARGE_TECH = [
     'WDAY',  # Workday
     'CRWD',  # CrowdStrike
     'NOW',   # ServiceNow
-]
+)
 
 # Financial Services
-FINANCE = [
+FINANCE = (
     'JPM',   # JPMorgan Chase
     'BAC',   # Bank of America
     'WFC',   # Wells Fargo
@@ -45,10 +45,10 @@ FINANCE = [
     'MKL',   # Markel Group
     'CME',   # CME Group
     'SCHW',  # Charles Schwab
-]
+)
 
 # Healthcare & Biotech
-HEALTHCARE = [
+HEALTHCARE = (
     'JNJ',   # Johnson & Johnson
     'UNH',   # UnitedHealth Group
     'PFE',   # Pfizer
@@ -61,10 +61,10 @@ HEALTHCARE = [
     'ISRG',  # Intuitive Surgical
     'DXCM',  # DexCom
     'VEEV',  # Veeva Systems
-]
+)
 
 # Industrial & Manufacturing
-INDUSTRIAL = [
+INDUSTRIAL = (
     'BA',    # Boeing
     'CAT',   # Caterpillar
     'DE',    # Deere & Company
@@ -73,10 +73,10 @@ INDUSTRIAL = [
     'ITT',   # ITT Inc
     'LMT',   # Lockheed Martin
     'RTX',   # Raytheon Technologies
-]
+)
 
 # Consumer & Retail
-CONSUMER = [
+CONSUMER = (
     'WMT',   # Walmart
     'TM',    # Toyota
     'HD',    # The Home Depot
@@ -87,10 +87,10 @@ CONSUMER = [
     'LOW',   # Lowe's
     'TJX',   # TJX Companies
     'ULTA',  # Ulta Beauty
-]
+)
 
 # Energy & Utilities
-ENERGY = [
+ENERGY = (
     'XOM',   # Exxon Mobil
     'CVX',   # Chevron
     'COP',   # ConocoPhillips
@@ -100,10 +100,10 @@ ENERGY = [
     'NEE',   # NextEra Energy
     'DUK',   # Duke Energy
     'SO',    # Southern Company
-]
+)
 
 # Communications & Media
-COMMUNICATIONS = [
+COMMUNICATIONS = (
     'T',     # AT&T
     'VZ',    # Verizon
     'CMCSA', # Comcast
@@ -111,10 +111,10 @@ COMMUNICATIONS = [
     'DIS',   # Walt Disney
     'PARA',  # Paramount Global
     'FOX',   # Fox Corporation
-]
+)
 
 # Other Sectors
-OTHER = [
+OTHER = (
     'PG',    # Procter & Gamble
     'KO',    # The Coca-Cola Company
     'PEP',   # PepsiCo
@@ -127,16 +127,16 @@ OTHER = [
     'BDX',   # Becton, Dickinson
     'ABT',   # Abbott Laboratories
     'CTLT',  # Catalent (if available)
-]
+)
 
 # S&P 500 Mid-Cap Representative
-MIDCAP = [
+MIDCAP = (
     'PCTY',  # Paylocity
     'SSNC',  # SS&C Technologies
     'VRSN',  # VeriSign
     'OKTA',  # Okta
     'DDOG',  # Datadog
-]
+)
 
 # All stocks combined (approximately 100)
 ALL_STOCKS = (
@@ -145,12 +145,15 @@ ALL_STOCKS = (
 )
 
 # Remove duplicates and sort
-ALL_STOCKS = sorted(list(set(ALL_STOCKS)))
+ALL_STOCKS = tuple(sorted(set(ALL_STOCKS)))
 
 # Ensure we have approximately 100
 if len(ALL_STOCKS) > 100:
     ALL_STOCKS = ALL_STOCKS[:100]
 
+# Set view of ALL_STOCKS for membership tests
+ALL_STOCKS_SET = frozenset(ALL_STOCKS)
+
 # Dictionary for easy access by category
 STOCK_CATEGORIES = {
     'mega_cap': MEGA_CAP,
@@ -166,16 +169,21 @@ STOCK_CATEGORIES = {
 }
 
 
-def get_stocks_by_category(category: str) -> list:
+def get_stocks_by_category(category: str) -> tuple:
     """Get stocks from a specific category."""
-    return STOCK_CATEGORIES.get(category, [])
+    return STOCK_CATEGORIES.get(category, ())
 
 
-def get_all_stocks() -> list:
+def get_all_stocks() -> tuple:
     """Get all stocks."""
     return ALL_STOCKS
 
 
+def is_known_symbol(symbol: str) -> bool:
+    """Check whether a symbol is in the stock list."""
+    return symbol in ALL_STOCKS_SET
+
+
 def get_stock_count() -> int:
     """Get total number of stocks."""
     return len(ALL_STOCKS)